@@ -8,6 +8,9 @@ consistent isometric tile assets for the game.
 NOTE: Cat sprites are NOT generated here - they use the dynamic renderer
 at https://web.beastyrabbit.com/ (see lib/cat-renderer/api.ts)
 
+Dependencies: see scripts/requirements.txt. Pillow-SIMD works as a drop-in
+replacement for Pillow and speeds up the decode/convert/encode pipeline.
+
 Usage:
     python scripts/generate_isometric_assets.py --api-key YOUR_API_KEY
     
@@ -24,6 +27,7 @@ Options:
     --buildings     Generate isometric building assets
     --all           Generate all tiles and buildings
     --dry-run       Print prompts without generating images
+    --no-cache      Bypass the prompt-hash disk cache
 
 Examples:
     # Preview all prompts without API calls
@@ -37,23 +41,39 @@ Examples:
 """
 
 import argparse
+import asyncio
 import base64
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
 import json
 import os
+import random
 import sys
+import tempfile
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
 try:
-    import requests
+    import httpx
 except ImportError:
-    print("Please install requests: pip install requests")
+    print("Please install httpx: pip install 'httpx[http2]'")
     sys.exit(1)
 
+# HTTP/2 multiplexing needs the optional h2 package (the [http2] extra);
+# without it httpx falls back to HTTP/1.1 with keep-alive
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 try:
-    from PIL import Image
+    from PIL import Image, ImageDraw
     import io
     HAS_PIL = True
 except ImportError:
@@ -61,22 +81,90 @@ except ImportError:
     print("Warning: Pillow not installed. Background removal disabled.")
     print("Install with: pip install Pillow")
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+    # Pure-Python flood fill still works, just much slower.
+    # Install with: pip install numpy scipy
+
+try:
+    from scipy import ndimage
+    HAS_SCIPY = HAS_NUMPY
+except ImportError:
+    HAS_SCIPY = False
+
+try:
+    import numba
+    HAS_NUMBA = HAS_NUMPY
+except ImportError:
+    HAS_NUMBA = False
+    # Optional: JIT-compiled flood fill for environments with NumPy but no
+    # SciPy. Install with: pip install numba
+
+try:
+    import pyspng
+    HAS_PYSPNG = HAS_NUMPY and hasattr(pyspng, 'encode')
+except ImportError:
+    HAS_PYSPNG = False
+    # Optional: ~10x faster PNG encoding than libpng's default level.
+    # Install with: pip install pyspng
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    # Optional: ~3x faster JSON parsing on the multi-MB image responses.
+    # Install with: pip install orjson
+
+try:
+    import liburing
+    HAS_LIBURING = sys.platform == "linux"
+except ImportError:
+    HAS_LIBURING = False
+    # Optional (Linux only): io_uring-submitted file writes.
+    # Install with: pip install liburing
+
+
+def _json_loads(data):
+    """Parse a JSON response body (orjson when available, stdlib otherwise)."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def _json_pretty(data) -> str:
+    """Pretty-print parsed JSON for error output."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
 
 # =============================================================================
 # Configuration
 # =============================================================================
 
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
-OPENROUTER_API_KEY = "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"
 MODEL = "google/gemini-2.5-flash-image-preview"  # Image generation model (native image output)
 
 # Tile dimensions
 TILE_WIDTH = 128
 TILE_HEIGHT = 64
 
-# Retry configuration
-MAX_RETRIES = 3
-RETRY_DELAY = 2  # seconds
+# Retry configuration (transient failures only; 4xx fails fast)
+MAX_RETRIES = 6
+RETRY_DELAY = 2  # seconds (base for decorrelated-jitter backoff)
+MAX_RETRY_WAIT = 60  # seconds
+
+# Throttling: max in-flight requests and minimum spacing between request starts
+MAX_CONCURRENT = 8
+MAX_REQUESTS_PER_MINUTE = 120  # token-bucket refill rate
+MAX_BATCH_SIZE = 16  # provider cap on images per request
+APPROX_CACHE_THRESHOLD = 0.92  # cosine similarity for an approx-cache hit
+APPROX_EMBED_DIM = 256  # hashed bag-of-words embedding width
+
+# Used for pre-flight budget checks before the real cost is known
+ESTIMATED_COST_PER_IMAGE = 0.04  # USD
 
 # =============================================================================
 # Style Constants for Consistent Prompts
@@ -85,62 +173,237 @@ RETRY_DELAY = 2  # seconds
 # Uses semantic positives instead of negatives (e.g., "clean background" not "no background")
 # =============================================================================
 
-# Style bible - consistent across all assets (Stardew Valley / Cozy Grove aesthetic)
-STYLE_BIBLE = "hand-painted, soft gradients, warm colors, slightly stylized, cozy game aesthetic like Stardew Valley, clean outlines, readable silhouettes"
-
-# Lighting description - consistent across all assets
-LIGHTING = "soft studio light from top-left, subtle drop shadow underneath"
-
 # Background color for chroma keying (will be removed in post-processing)
 # Using bright magenta (#FF00FF) as it's unlikely to appear in natural game assets
-CHROMA_KEY_BG = "solid bright magenta (#FF00FF) background"
+_CHROMA_KEY_BG = "solid bright magenta (#FF00FF) background"
 
-# Constraint template for tiles
-TILE_CONSTRAINTS = f"single tile only, centered, {CHROMA_KEY_BG}, crisp edges, consistent density"
 
-# Constraint template for buildings  
-BUILDING_CONSTRAINTS = f"single building only, centered, {CHROMA_KEY_BG}, crisp edges, readable silhouette"
+@dataclass(frozen=True, slots=True)
+class Style:
+    """Style bible bundled on one frozen slots object.
+
+    The prompt builders read these in hot f-strings; attribute access on a
+    slots instance skips the module-dict lookup that separate globals would
+    pay, and freezing guards against the asset types drifting apart.
+    """
+
+    # Consistent across all assets (Stardew Valley / Cozy Grove aesthetic)
+    bible: str = "hand-painted, soft gradients, warm colors, slightly stylized, cozy game aesthetic like Stardew Valley, clean outlines, readable silhouettes"
+
+    # Lighting description - consistent across all assets
+    lighting: str = "soft studio light from top-left, subtle drop shadow underneath"
+
+    # Constraint template for tiles
+    tile_constraints: str = f"single tile only, centered, {_CHROMA_KEY_BG}, crisp edges, consistent density"
+
+    # Constraint template for buildings
+    building_constraints: str = f"single building only, centered, {_CHROMA_KEY_BG}, crisp edges, readable silhouette"
+
+
+STYLE = Style()
 
 
 # =============================================================================
 # Post-Processing: Chroma Key Background Removal
 # =============================================================================
 
-def remove_chroma_key_background(image_bytes: bytes, tolerance: int = 70, sample_size: int = 10) -> bytes:
+def _corner_bg_color(rgb: "np.ndarray", sample_size: int) -> "np.ndarray":
+    """Average background color from 10x10 regions in all 4 corners."""
+    s = sample_size
+    corners = np.stack([
+        rgb[:s, :s].reshape(-1, 3),
+        rgb[:s, -s:].reshape(-1, 3),
+        rgb[-s:, :s].reshape(-1, 3),
+        rgb[-s:, -s:].reshape(-1, 3),
+    ])
+    bg_color = corners.reshape(-1, 3).mean(0)
+    print(f"  (Detected background color: RGB({int(bg_color[0])}, {int(bg_color[1])}, {int(bg_color[2])}))")
+    return bg_color
+
+
+def _remove_background_numpy(img: "Image.Image", tolerance: int, sample_size: int) -> "Image.Image":
+    """
+    Vectorized background removal: corner sampling, color-distance threshold,
+    and border-seeded flood fill all happen on NumPy arrays (the flood fill
+    itself runs in C via scipy.ndimage.binary_propagation).
+    """
+    arr = np.asarray(img, dtype=np.int16)
+    rgb = arr[..., :3]
+
+    bg_color = _corner_bg_color(rgb, sample_size)
+
+    # All pixels within tolerance of the background color (squared distance
+    # avoids a sqrt per pixel)
+    mask = ((rgb - bg_color) ** 2).sum(-1) <= tolerance * tolerance
+
+    # Flood fill from the image border: seed with border pixels that match,
+    # then propagate through the mask. This reproduces the BFS exactly but in C.
+    seed = np.zeros_like(mask)
+    seed[0] = seed[-1] = seed[:, 0] = seed[:, -1] = True
+    seed &= mask
+    flood = ndimage.binary_propagation(seed, mask=mask)
+
+    # Remove background pixels (make transparent)
+    rgba = arr.astype(np.uint8)
+    rgba[flood] = 0
+    print(f"  (Removed {int(flood.sum())} background pixels)")
+
+    return Image.fromarray(rgba, 'RGBA')
+
+
+if HAS_NUMBA:
+    @numba.njit(cache=True)
+    def _flood_fill_numba(rgb, bg_r, bg_g, bg_b, tol2):
+        """JIT-compiled BFS flood fill from the border; returns a removal mask.
+
+        Same algorithm as the pure-Python fallback, but with a preallocated
+        visitation bitmap and an int64 index queue it runs at native speed
+        (~50x the interpreter) without needing SciPy.
+        """
+        height, width = rgb.shape[0], rgb.shape[1]
+        visited = np.zeros(height * width, dtype=np.uint8)
+        remove = np.zeros(height * width, dtype=np.uint8)
+        # Visited-on-enqueue means each pixel enters the queue at most once
+        queue = np.empty(height * width, dtype=np.int64)
+        tail = 0
+
+        # Seed from all edge pixels
+        for x in range(width):
+            for idx in (x, (height - 1) * width + x):
+                if not visited[idx]:
+                    visited[idx] = 1
+                    queue[tail] = idx
+                    tail += 1
+        for y in range(height):
+            for idx in (y * width, y * width + width - 1):
+                if not visited[idx]:
+                    visited[idx] = 1
+                    queue[tail] = idx
+                    tail += 1
+
+        head = 0
+        while head < tail:
+            idx = queue[head]
+            head += 1
+            y = idx // width
+            x = idx - y * width
+
+            dr = rgb[y, x, 0] - bg_r
+            dg = rgb[y, x, 1] - bg_g
+            db = rgb[y, x, 2] - bg_b
+            if dr * dr + dg * dg + db * db <= tol2:
+                remove[idx] = 1
+                # Enqueue 4-connected neighbors
+                if x + 1 < width and not visited[idx + 1]:
+                    visited[idx + 1] = 1
+                    queue[tail] = idx + 1
+                    tail += 1
+                if x - 1 >= 0 and not visited[idx - 1]:
+                    visited[idx - 1] = 1
+                    queue[tail] = idx - 1
+                    tail += 1
+                if y + 1 < height and not visited[idx + width]:
+                    visited[idx + width] = 1
+                    queue[tail] = idx + width
+                    tail += 1
+                if y - 1 >= 0 and not visited[idx - width]:
+                    visited[idx - width] = 1
+                    queue[tail] = idx - width
+                    tail += 1
+
+        return remove.reshape(height, width)
+
+
+def _remove_background_numba(img: "Image.Image", tolerance: int, sample_size: int) -> "Image.Image":
+    """Flood fill via the numba kernel (NumPy present, SciPy missing)."""
+    arr = np.asarray(img, dtype=np.int16)
+    rgb = np.ascontiguousarray(arr[..., :3])
+
+    bg_color = _corner_bg_color(rgb, sample_size)
+    remove = _flood_fill_numba(
+        rgb,
+        int(bg_color[0]), int(bg_color[1]), int(bg_color[2]),
+        tolerance * tolerance,
+    )
+
+    # Remove background pixels (make transparent)
+    flood = remove.astype(np.bool_)
+    rgba = arr.astype(np.uint8)
+    rgba[flood] = 0
+    print(f"  (Removed {int(flood.sum())} background pixels)")
+
+    return Image.fromarray(rgba, 'RGBA')
+
+
+def _encode_image(img: "Image.Image", output_format: str) -> bytes:
+    """Encode a processed image for disk.
+
+    WebP lossless is 30-50% smaller than PNG at similar encode speed; for
+    PNG, pyspng (when installed) encodes ~10x faster than libpng's default
+    compression level.
+    """
+    if output_format == "webp":
+        output = io.BytesIO()
+        img.save(output, format='WEBP', lossless=True, method=4)
+        return output.getvalue()
+
+    if HAS_PYSPNG:
+        return pyspng.encode(np.asarray(img), compression_level=1)
+
+    output = io.BytesIO()
+    img.save(output, format='PNG')
+    return output.getvalue()
+
+
+def remove_chroma_key_background(image, tolerance: int = 70, sample_size: int = 10,
+                                 output_format: str = "png") -> bytes:
     """
     Remove background by sampling corner regions and flood filling.
-    
+
     1. Sample 10x10 pixel regions from each corner
     2. Calculate average color from these samples
     3. Flood fill from edges, removing pixels similar to the sampled background
-    
+
+    Uses the vectorized NumPy/SciPy path when available (50-200x faster on
+    1K images); falls back to a pure-Python flood fill otherwise.
+
     Args:
-        image_bytes: Raw image bytes from API
+        image: Raw image bytes from the API, or an already-open PIL Image
+               (passing an Image skips a redundant decode of the same bytes)
         tolerance: Color matching tolerance for flood fill (0-255)
         sample_size: Size of corner sample region (e.g., 10 = 10x10 pixels)
-    
+        output_format: "png" or "webp" (lossless)
+
     Returns:
-        PNG image bytes with transparent background
+        Encoded image bytes with transparent background
     """
     if not HAS_PIL:
-        return image_bytes
-    
-    from collections import deque
-    
-    # Load image
-    img = Image.open(io.BytesIO(image_bytes))
-    
+        return image
+
+    # Load image (unless the caller already did)
+    img = image if isinstance(image, Image.Image) else Image.open(io.BytesIO(image))
+
     # Convert to RGBA if needed
     if img.mode != 'RGBA':
         img = img.convert('RGBA')
-    
+
+    if HAS_SCIPY:
+        img = _remove_background_numpy(img, tolerance, sample_size)
+    elif HAS_NUMBA:
+        img = _remove_background_numba(img, tolerance, sample_size)
+    elif hasattr(ImageDraw, 'floodfill'):
+        _remove_background_pil(img, tolerance, sample_size)
+    else:
+        _remove_background_python(img, tolerance, sample_size)
+
+    return _encode_image(img, output_format)
+
+
+def _sample_background_color(img: "Image.Image", sample_size: int) -> Optional[tuple]:
+    """Average the RGB color of 10x10 regions in all 4 corners."""
     pixels = img.load()
     width, height = img.size
-    
-    def color_distance(c1, c2):
-        """Calculate Euclidean color distance between two RGB tuples."""
-        return ((c1[0] - c2[0])**2 + (c1[1] - c2[1])**2 + (c1[2] - c2[2])**2) ** 0.5
-    
+
     def sample_corner_region(start_x, start_y, size):
         """Sample a region and return list of RGB colors."""
         colors = []
@@ -152,7 +415,7 @@ def remove_chroma_key_background(image_bytes: bytes, tolerance: int = 70, sample
                     r, g, b, a = pixels[x, y]
                     colors.append((r, g, b))
         return colors
-    
+
     # Sample 10x10 regions from all 4 corners
     corner_regions = [
         (0, 0),                                    # Top-left
@@ -160,28 +423,70 @@ def remove_chroma_key_background(image_bytes: bytes, tolerance: int = 70, sample
         (0, height - sample_size),                 # Bottom-left
         (width - sample_size, height - sample_size)  # Bottom-right
     ]
-    
+
     all_bg_colors = []
     for cx, cy in corner_regions:
         all_bg_colors.extend(sample_corner_region(cx, cy, sample_size))
-    
+
     if not all_bg_colors:
         print("  (No corner samples found)")
-        return image_bytes
-    
+        return None
+
     # Calculate average background color from all corner samples
     avg_r = sum(c[0] for c in all_bg_colors) // len(all_bg_colors)
     avg_g = sum(c[1] for c in all_bg_colors) // len(all_bg_colors)
     avg_b = sum(c[2] for c in all_bg_colors) // len(all_bg_colors)
     bg_color = (avg_r, avg_g, avg_b)
-    
+
     print(f"  (Detected background color: RGB({avg_r}, {avg_g}, {avg_b}))")
-    
-    # Flood fill from all edges
-    visited = set()
-    to_remove = set()
+    return bg_color
+
+
+def _remove_background_pil(img: "Image.Image", tolerance: int, sample_size: int) -> None:
+    """
+    Flood fill using PIL's C-level ImageDraw.floodfill, in place.
+
+    Paints a 1-pixel border of the detected background color so every corner
+    is a guaranteed seed, then flood fills from all 4 corners (robust against
+    disconnected background regions). No per-pixel Python calls.
+    """
+    bg_color = _sample_background_color(img, sample_size)
+    if bg_color is None:
+        return
+
+    width, height = img.size
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([(0, 0), (width - 1, height - 1)], outline=bg_color + (255,))
+
+    for corner in [(0, 0), (width - 1, 0), (0, height - 1), (width - 1, height - 1)]:
+        ImageDraw.floodfill(img, xy=corner, value=(0, 0, 0, 0), thresh=tolerance)
+
+
+def _remove_background_python(img: "Image.Image", tolerance: int, sample_size: int) -> None:
+    """Pure-Python fallback: BFS flood fill from the edges, in place."""
+    from collections import deque
+
+    bg_color = _sample_background_color(img, sample_size)
+    if bg_color is None:
+        return
+
+    pixels = img.load()
+    width, height = img.size
+    bg_r, bg_g, bg_b = bg_color
+
+    # Compare squared distances: dist <= tol is equivalent to dist2 <= tol*tol,
+    # and skipping the sqrt (plus the function-call frame) matters in a loop
+    # that runs millions of times per 1K image.
+    tol2 = tolerance * tolerance
+
+    # Flood fill from all edges. Visitation/removal state lives in flat
+    # bytearray bitmaps indexed by y*width+x: a set of (x, y) tuples costs
+    # ~56 bytes per entry (~60 MB for a 1K image) plus hashing per lookup,
+    # while the bitmaps are ~2 MB total and pure integer arithmetic.
+    visited = bytearray(width * height)
+    to_remove = bytearray(width * height)
     queue = deque()
-    
+
     # Start from all edge pixels
     for x in range(width):
         queue.append((x, 0))
@@ -189,38 +494,39 @@ def remove_chroma_key_background(image_bytes: bytes, tolerance: int = 70, sample
     for y in range(height):
         queue.append((0, y))
         queue.append((width - 1, y))
-    
+
     while queue:
         x, y = queue.popleft()
-        
-        if (x, y) in visited:
-            continue
+
         if x < 0 or x >= width or y < 0 or y >= height:
             continue
-            
-        visited.add((x, y))
+        idx = y * width + x
+        if visited[idx]:
+            continue
+
+        visited[idx] = 1
         r, g, b, a = pixels[x, y]
-        
+
         # Check if this pixel is close to the background color
-        dist = color_distance((r, g, b), bg_color)
-        if dist <= tolerance:
-            to_remove.add((x, y))
+        dr = r - bg_r
+        dg = g - bg_g
+        db = b - bg_b
+        if dr * dr + dg * dg + db * db <= tol2:
+            to_remove[idx] = 1
             # Add 4-connected neighbors
             queue.append((x + 1, y))
             queue.append((x - 1, y))
             queue.append((x, y + 1))
             queue.append((x, y - 1))
-    
+
     # Remove background pixels (make transparent)
-    for x, y in to_remove:
-        pixels[x, y] = (0, 0, 0, 0)
-    
-    print(f"  (Removed {len(to_remove)} background pixels)")
-    
-    # Save to bytes
-    output = io.BytesIO()
-    img.save(output, format='PNG')
-    return output.getvalue()
+    removed = 0
+    for idx, flagged in enumerate(to_remove):
+        if flagged:
+            pixels[idx % width, idx // width] = (0, 0, 0, 0)
+            removed += 1
+
+    print(f"  (Removed {removed} background pixels)")
 
 
 # =============================================================================
@@ -421,23 +727,169 @@ BUILDINGS = {
 # API Client
 # =============================================================================
 
-class OpenRouterClient:
-    """Client for OpenRouter API image generation."""
-    
-    def __init__(self, api_key: str):
+def _conditioned_key(prompt: str, base_image: Optional[bytes]) -> str:
+    """Cache/memo key for a prompt, extended with the conditioning image hash.
+
+    The same variant prompt conditioned on a different base tile is a
+    different generation; folding the base image's digest into the key
+    keeps cache entries from aliasing across bases.
+    """
+    if base_image is None:
+        return prompt
+    return f"{prompt}@{hashlib.sha256(base_image).hexdigest()[:16]}"
+
+
+class RateLimiter:
+    """
+    Proactive token-bucket throttle on request starts.
+
+    A blind 429-retry loop wastes minutes on large batches; this spends
+    from a capacity pool that refills continuously (requests_per_minute /
+    60 per second, measured with time.monotonic), so bursts up to the
+    bucket size go out immediately and sustained load settles at exactly
+    the quota rate with no fixed per-request sleep. The pool is resynced
+    from the rate-limit headers OpenRouter sends back, so the retry path
+    stays cold.
+    """
+
+    def __init__(self, requests_per_minute: float = MAX_REQUESTS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        # Start with a full bucket so the first burst isn't throttled
+        self._capacity = float(MAX_CONCURRENT)
+        self._max_capacity = float(MAX_CONCURRENT)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._retry_after = 0.0  # absolute monotonic deadline from Retry-After
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._capacity = min(
+            self._max_capacity,
+            self._capacity + (now - self._last_refill) * self.requests_per_minute / 60.0,
+        )
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """Wait until a unit of request capacity is available, then spend it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._retry_after:
+                    await asyncio.sleep(self._retry_after - now)
+                    continue
+                self._refill()
+                if self._capacity >= 1.0:
+                    self._capacity -= 1.0
+                    return
+                # Sleep exactly until the next unit accrues
+                await asyncio.sleep(
+                    (1.0 - self._capacity) * 60.0 / self.requests_per_minute
+                )
+
+    def update_from_headers(self, headers) -> None:
+        """Resync capacity from `retry-after` / `x-ratelimit-remaining-requests`."""
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                self._retry_after = time.monotonic() + min(float(retry_after), 30.0)
+                self._capacity = 0.0
+            except ValueError:
+                pass
+            return
+
+        remaining = headers.get(
+            "x-ratelimit-remaining-requests",
+            headers.get("x-ratelimit-remaining"),
+        )
+        if remaining is not None:
+            try:
+                remaining = int(remaining)
+            except ValueError:
+                return
+            # The server's count is authoritative: never hold more capacity
+            # than it says is left (clamp only downward; concurrent responses
+            # racing this update must not inflate the bucket)
+            self._capacity = min(self._capacity, float(remaining))
+
+
+class AsyncOpenRouterClient:
+    """Async client for OpenRouter API image generation.
+
+    Generation is pure I/O wait, so requests are issued concurrently with
+    httpx instead of blocking one-by-one on a requests.Session. Use as an
+    async context manager so the shared connection pool is closed cleanly.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache_dir: Optional[Path] = None,
+        budget: float = 0.0,
+        concurrency: int = MAX_CONCURRENT,
+    ):
         self.api_key = api_key
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            # All cache entries land flat in this dir: create it once here
+            # instead of per write
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        self.budget = budget  # USD; 0 disables the budget check
+        self.concurrency = concurrency
+        self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
             "HTTP-Referer": "https://github.com/cat-colony-idle",
             "X-Title": "Cat Colony Idle Game Asset Generator"
-        })
+        }
+        self.session: Optional[httpx.AsyncClient] = None
+        self.download_session: Optional[httpx.AsyncClient] = None
+        # In-memory memo: (prompt, aspect_ratio) -> generation task. Collapses
+        # byte-identical prompts within a run (an async-safe stand-in for
+        # functools.lru_cache, which can't wrap coroutines); awaiting the
+        # shared task also coalesces duplicates that are still in flight.
+        self._memo: dict = {}
+        # Throttling (shared across all concurrent generation tasks)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = RateLimiter()
         # Cost tracking
         self.total_cost = 0.0
         self.total_requests = 0
         self.successful_requests = 0
-    
+
+    @staticmethod
+    def _make_client(timeout: float, headers: Optional[dict] = None) -> "httpx.AsyncClient":
+        # With the h2 extra installed, every request multiplexes over one
+        # warm TLS connection; on the HTTP/1.1 fallback a generous
+        # keepalive still spans the gaps between batches, so requests
+        # after the first skip the DNS lookup + TLS handshake
+        # (~100ms each at this request volume)
+        return httpx.AsyncClient(
+            http2=HAS_HTTP2,
+            limits=httpx.Limits(
+                max_connections=20,
+                max_keepalive_connections=20,
+                keepalive_expiry=120,
+            ),
+            timeout=httpx.Timeout(timeout),
+            headers=headers,
+        )
+
+    async def __aenter__(self) -> "AsyncOpenRouterClient":
+        # Image generation can take a while: generous request timeout
+        self.session = self._make_client(120.0, headers=self.headers)
+        # Image URLs in responses point at CDN hosts, not openrouter.ai;
+        # a separate client keeps those downloads from competing with API
+        # calls for pool slots (and keeps auth headers off them)
+        self.download_session = self._make_client(60.0)
+        self._load_cost_manifest()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self.session:
+            await self.session.aclose()
+        if self.download_session:
+            await self.download_session.aclose()
+
     def get_cost_summary(self) -> dict:
         """Get summary of API usage and costs."""
         return {
@@ -447,28 +899,243 @@ class OpenRouterClient:
             "total_cost_usd": self.total_cost,
         }
     
-    def generate_image(
-        self, 
-        prompt: str, 
+    @property
+    def _manifest_path(self) -> Optional[Path]:
+        return self.cache_dir / "manifest.jsonl" if self.cache_dir else None
+
+    def _load_cost_manifest(self) -> None:
+        """Resume spend tracking from previous runs of this cache dir.
+
+        total_cost only lived for one process, so reruns silently re-spent;
+        summing the manifest makes the --budget check hold across runs.
+        """
+        path = self._manifest_path
+        if path is None or not path.exists():
+            return
+        for line in path.read_text().splitlines():
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                continue
+            self.total_cost += float(entry.get("cost", 0.0))
+        if self.total_cost > 0:
+            print(f"(Resumed cost tracking: ${self.total_cost:.4f} spent in earlier runs)")
+
+    def _record_cost(self, cache_path: Optional[Path], cost: float) -> None:
+        """Append a hash -> cost entry to the cache manifest."""
+        path = self._manifest_path
+        if path is None:
+            return
+        entry = {
+            "hash": cache_path.stem if cache_path else None,
+            "cost": cost,
+            "path": str(cache_path) if cache_path else None,
+        }
+        with open(path, "a") as manifest:
+            manifest.write(json.dumps(entry) + "\n")
+
+    def _within_budget(self, estimated_cost: float) -> bool:
+        """Pre-flight budget check; skips generation instead of overshooting."""
+        if self.budget <= 0:
+            return True
+        if self.total_cost + estimated_cost > self.budget:
+            print(f"  ✗ Budget ${self.budget:.2f} would be exceeded "
+                  f"(spent ${self.total_cost:.4f}) — skipping generation")
+            return False
+        return True
+
+    def cache_path(self, prompt: str, aspect_ratio: str, suffix: str = ".png") -> Optional[Path]:
+        """Disk-cache location for a prompt, or None when caching is disabled.
+
+        Prompts are deterministic functions of BiomeConfig/BUILDINGS, so the
+        SHA-256 over every input that shapes the output — prompt, model and
+        aspect ratio — is a stable key across runs. The NUL separators keep
+        distinct input tuples from concatenating to the same byte string.
+        """
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(
+            "\x00".join((prompt, MODEL, aspect_ratio)).encode()
+        ).hexdigest()
+        return self.cache_dir / f"{key}{suffix}"
+
+    async def generate_image(
+        self,
+        prompt: str,
         aspect_ratio: str = "16:9",
-        retries: int = MAX_RETRIES
+        retries: int = MAX_RETRIES,
+        base_image: Optional[bytes] = None
     ) -> Optional[bytes]:
         """
         Generate an image using the Gemini 2.5 Flash model.
-        
+
+        Checks the disk cache first; a hit skips the API call (and its cost)
+        entirely. Results are written back to the cache on success.
+
         Args:
             prompt: The image generation prompt
             aspect_ratio: Aspect ratio for the image. Supported: 1:1, 2:3, 3:2, 3:4, 4:3, 4:5, 5:4, 9:16, 16:9, 21:9
             retries: Number of retry attempts
-        
-        Returns the image bytes or None if generation fails.
+            base_image: Optional conditioning image attached to the request
+                (e.g. a base tile whose style the output should match)
+
+        Returns the image bytes or None if generation fails. Bytes are
+        immutable, so handing the same object to several callers is safe.
         """
+        key = (_conditioned_key(prompt, base_image), aspect_ratio)
+        task = self._memo.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._generate_image_memoized(prompt, aspect_ratio, retries, base_image)
+            )
+            self._memo[key] = task
+        return await task
+
+    async def _generate_image_memoized(
+        self,
+        prompt: str,
+        aspect_ratio: str,
+        retries: int,
+        base_image: Optional[bytes] = None
+    ) -> Optional[bytes]:
+        """Disk-cache lookup + budget check + API call for one unique prompt."""
+        cache_path = self.cache_path(_conditioned_key(prompt, base_image), aspect_ratio)
+        if cache_path is not None and cache_path.exists():
+            print(f"  (cache hit: {cache_path.name})")
+            return cache_path.read_bytes()
+
+        if not self._within_budget(ESTIMATED_COST_PER_IMAGE):
+            return None
+
+        image_data, cost = await self._generate_image_uncached(
+            prompt, aspect_ratio, retries, base_image
+        )
+
+        if image_data:
+            if cache_path is not None:
+                cache_path.write_bytes(image_data)
+            self._record_cost(cache_path, cost)
+        return image_data
+
+    async def generate_image_batch(
+        self,
+        prompt: str,
+        count: int,
+        aspect_ratio: str = "16:9",
+        retries: int = MAX_RETRIES,
+        batch_size: int = MAX_BATCH_SIZE
+    ) -> list:
+        """
+        Generate several images from one prompt in few API requests.
+
+        Batching e.g. the 16 autotile variants of a biome consumes one RPM
+        slot and tokenizes the shared biome description once instead of 16
+        times. Counts above `batch_size` (the provider's per-request image
+        cap) are split into concurrent chunked requests; note the same
+        prompt is sent for every chunk, so prompts that enumerate
+        per-index content should keep count within one chunk. Returns a
+        list of length `count` whose entries are image bytes, or None for
+        images the model did not deliver (callers can regenerate those
+        individually).
+        """
+        if count > batch_size:
+            chunks = [
+                (start, min(batch_size, count - start))
+                for start in range(0, count, batch_size)
+            ]
+            parts = await asyncio.gather(*[
+                self._generate_batch_request(prompt, start, size, aspect_ratio, retries)
+                for start, size in chunks
+            ])
+            return [image_data for part in parts for image_data in part]
+        return await self._generate_batch_request(prompt, 0, count, aspect_ratio, retries)
+
+    async def _generate_batch_request(
+        self,
+        prompt: str,
+        start: int,
+        count: int,
+        aspect_ratio: str,
+        retries: int
+    ) -> list:
+        """One batched API request for images start..start+count-1."""
+        cache_paths = [
+            self.cache_path(f"{prompt}#{index}", aspect_ratio)
+            for index in range(start, start + count)
+        ]
+        cached = [
+            p.read_bytes() if p is not None and p.exists() else None
+            for p in cache_paths
+        ]
+        hits = sum(1 for image_data in cached if image_data is not None)
+        if hits == count:
+            print(f"  (cache hit: batch of {count})")
+            return cached
+        if hits:
+            # The batch prompt enumerates every variant in order, so a
+            # request can't target just the missing indices — re-issuing it
+            # would re-pay for all {count} images. Serve what's on disk and
+            # let the caller's single-variant fallback fill the gaps (which
+            # backfills these slots, so the next run is a full cache hit).
+            print(f"  (partial cache hit: {hits}/{count}, regenerating the rest individually)")
+            return cached
+
+        if not self._within_budget(ESTIMATED_COST_PER_IMAGE * count):
+            return [None] * count
+
+        payload = self._build_payload(prompt, aspect_ratio, count=count)
+        images, batch_cost = await self._request_images(payload, retries, expected=count)
+        images = images or []
+
+        results = list(images[:count]) + [None] * (count - len(images))
+        delivered = sum(1 for image_data in results if image_data)
+        for image_data, cache_path in zip(results, cache_paths):
+            if image_data and cache_path is not None:
+                cache_path.write_bytes(image_data)
+                self._record_cost(cache_path, batch_cost / delivered)
+        return results
+
+    async def _generate_image_uncached(
+        self,
+        prompt: str,
+        aspect_ratio: str,
+        retries: int,
+        base_image: Optional[bytes] = None
+    ) -> tuple:
+        """Issue the actual API request (with retries); returns (bytes, USD spent)."""
+        payload = self._build_payload(prompt, aspect_ratio, base_image=base_image)
+        images, cost = await self._request_images(payload, retries, expected=1)
+        return (images[0] if images else None), cost
+
+    def _build_payload(
+        self,
+        prompt: str,
+        aspect_ratio: str,
+        count: int = 1,
+        base_image: Optional[bytes] = None
+    ) -> dict:
+        """Build the chat-completions payload for image generation."""
+        if base_image is not None:
+            # Multimodal content: the conditioning image rides along with
+            # the text so the model re-renders rather than starts fresh
+            content = [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": "data:image/png;base64,"
+                               + base64.b64encode(base_image).decode()
+                    },
+                },
+                {"type": "text", "text": prompt},
+            ]
+        else:
+            content = prompt
         payload = {
             "model": MODEL,
             "messages": [
                 {
                     "role": "user",
-                    "content": prompt
+                    "content": content
                 }
             ],
             # Required for image generation
@@ -479,119 +1146,501 @@ class OpenRouterClient:
                 "image_size": "1K"
             }
         }
-        
+        if count > 1:
+            payload["image_config"]["image_count"] = count
+        return payload
+
+    @staticmethod
+    def _decode_data_url(url: str) -> bytes:
+        # Split once from the left: data URLs for 1K images run to several MB,
+        # so avoid building the extra list a full split would allocate
+        base64_data = url.split(",", 1)[1] if "," in url else url
+        return base64.b64decode(base64_data)
+
+    async def _image_bytes_from_url(self, image_url: str) -> Optional[bytes]:
+        """Resolve an image reference: decode a data URL or download over HTTP."""
+        if image_url.startswith("data:image"):
+            return self._decode_data_url(image_url)
+        if image_url.startswith("http"):
+            # Reuse the download client's pool: a one-off request here would
+            # pay a fresh TCP + TLS handshake per downloaded image.
+            # Stream in 64 KiB chunks into one growing buffer rather than
+            # letting httpx accumulate the full body internally first —
+            # with several multi-MB downloads in flight, holding one copy
+            # per image instead of two keeps peak RSS flat
+            async with self.download_session.stream("GET", image_url) as img_response:
+                if img_response.status_code != 200:
+                    return None
+                buffer = bytearray()
+                async for chunk in img_response.aiter_bytes(64 * 1024):
+                    buffer += chunk
+                return bytes(buffer)
+        return None
+
+    async def _request_images(
+        self,
+        payload: dict,
+        retries: int,
+        expected: int
+    ) -> tuple:
+        """POST a generation payload; returns (decoded image bytes, USD spent).
+
+        The spend is what *this* call's responses cost. Diffing the shared
+        total_cost counter across an await would also absorb every other
+        request that completed in the window, inflating manifest entries.
+        """
+        # Decorrelated-jitter exponential backoff: each wait is drawn from
+        # U(RETRY_DELAY, 3 * previous wait), capped. Jitter keeps the many
+        # concurrent workers from synchronizing their retries into a
+        # thundering herd after a shared failure.
+        wait = RETRY_DELAY
+        spent = 0.0
         for attempt in range(retries):
+            retry_after = None
             try:
                 self.total_requests += 1
-                response = self.session.post(
-                    OPENROUTER_API_URL,
-                    json=payload,
-                    timeout=120  # Image generation can take a while
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Track cost from response (OpenRouter includes usage data)
+                async with self.semaphore:
+                    await self.rate_limiter.acquire()
+                    response = await self.session.post(OPENROUTER_API_URL, json=payload)
+                    status = response.status_code
+                    self.rate_limiter.update_from_headers(response.headers)
+                    if status == 200:
+                        # Bodies carry base64-encoded images, often several
+                        # MB; orjson parses them ~3x faster than stdlib json
+                        data = _json_loads(response.content)
+                    elif status == 429:
+                        data = None
+                        retry_after = response.headers.get("Retry-After")
+                    else:
+                        data = None
+                        error_text = response.text
+
+                if status == 200:
+
+                    # Track cost from response (OpenRouter includes usage data;
+                    # total_cost directly, or the cost field)
                     if "usage" in data:
                         usage = data["usage"]
-                        # OpenRouter may include total_cost directly
-                        if "total_cost" in usage:
-                            self.total_cost += float(usage["total_cost"])
-                        # Or calculate from native_tokens_total and cost headers
-                        elif "cost" in usage:
-                            self.total_cost += float(usage["cost"])
+                        cost = float(usage.get("total_cost", usage.get("cost", 0.0)))
+                        spent += cost
+                        self.total_cost += cost
                     
                     # Handle OpenRouter Gemini image generation response format
-                    # Images are in: choices[0].message.images[0].image_url.url
+                    # Images are in: choices[0].message.images[N].image_url.url
                     if "choices" in data and len(data["choices"]) > 0:
                         message = data["choices"][0].get("message", {})
-                        
+
                         # Primary format: images array with image_url objects
                         images = message.get("images", [])
+                        # Fallback: content itself may be base64 image data
+                        content = message.get("content", "")
+
                         if images:
-                            # Get the first image
-                            image_obj = images[0]
-                            # Handle both possible structures
-                            image_url = (
-                                image_obj.get("image_url", {}).get("url") or 
+                            image_urls = [
+                                # Handle both possible structures
+                                image_obj.get("image_url", {}).get("url") or
                                 image_obj.get("imageUrl", {}).get("url") or
                                 image_obj.get("url")
-                            )
-                            
-                            if image_url:
-                                # Check if it's a base64 data URL
-                                if image_url.startswith("data:image"):
-                                    base64_data = image_url.split(",")[1] if "," in image_url else image_url
-                                    self.successful_requests += 1
-                                    return base64.b64decode(base64_data)
-                                # Or a regular URL to download
-                                elif image_url.startswith("http"):
-                                    img_response = requests.get(image_url, timeout=60)
-                                    if img_response.status_code == 200:
-                                        self.successful_requests += 1
-                                        return img_response.content
-                        
-                        # Fallback: check if content itself is base64 image data
-                        content = message.get("content", "")
-                        if content and content.startswith("data:image"):
-                            base64_data = content.split(",")[1] if "," in content else content
-                            self.successful_requests += 1
-                            return base64.b64decode(base64_data)
-                    
-                    print(f"  Unexpected response format: {json.dumps(data, indent=2)[:500]}")
-                    
-                elif response.status_code == 429:
-                    # Rate limited
-                    wait_time = RETRY_DELAY * (attempt + 1) * 2
-                    print(f"  Rate limited. Waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
+                                for image_obj in images[:expected]
+                            ]
+                            # Release the parsed response before decoding: the
+                            # dict pins the multi-MB base64 payloads, and at
+                            # concurrency N those transients multiply peak RSS
+                            del data, message, images
+
+                            decoded = []
+                            for index, image_url in enumerate(image_urls):
+                                image_bytes = None
+                                if image_url:
+                                    image_bytes = await self._image_bytes_from_url(image_url)
+                                    image_urls[index] = None  # free the data URL
+                                decoded.append(image_bytes)
+
+                            if any(decoded):
+                                self.successful_requests += 1
+                                return decoded, spent
+
+                            if content and content.startswith("data:image"):
+                                self.successful_requests += 1
+                                return [self._decode_data_url(content)], spent
+
+                            print("  Unexpected response format: images listed but none decodable")
+                        else:
+                            if content and content.startswith("data:image"):
+                                self.successful_requests += 1
+                                return [self._decode_data_url(content)], spent
+
+                            print(f"  Unexpected response format: {_json_pretty(data)[:500]}")
+                    else:
+                        print(f"  Unexpected response format: {_json_pretty(data)[:500]}")
                     
+                elif status == 429:
+                    # Rate limited: the server's Retry-After beats any guess
+                    if retry_after is not None:
+                        try:
+                            wait = min(float(retry_after), MAX_RETRY_WAIT)
+                        except ValueError:
+                            pass
+                    print(f"  Rate limited. Waiting {wait:.1f}s...")
+
                 else:
-                    print(f"  API error {response.status_code}: {response.text[:200]}")
-                    
-            except requests.exceptions.Timeout:
+                    print(f"  API error {status}: {error_text[:200]}")
+                    if 400 <= status < 500 and status != 408:
+                        # Bad request / auth / quota config: retrying the
+                        # identical payload only burns the retry budget
+                        return None, spent
+
+            except httpx.TimeoutException:
                 print(f"  Request timed out (attempt {attempt + 1}/{retries})")
             except Exception as e:
                 print(f"  Error: {e}")
-            
+
             if attempt < retries - 1:
-                time.sleep(RETRY_DELAY)
-        
-        return None
+                await asyncio.sleep(wait)
+                wait = min(MAX_RETRY_WAIT, random.uniform(RETRY_DELAY, wait * 3))
+
+        return None, spent
+
+
+class ApproxCache:
+    """Approximate prompt cache: near-duplicate prompts reuse a cached image.
+
+    The exact disk cache only hits on byte-identical prompts; autotile
+    variants of one biome share ~95% of their text and still each pay an
+    API call. This embeds prompts as L2-normalized hashed bag-of-words
+    vectors (stable blake2b token hashing, so vectors survive restarts)
+    and, when the best cosine similarity clears the threshold, copies the
+    cached image instead of generating. Opt-in via --approx-cache: the
+    reused image is a stand-in, not a faithful render of the new prompt.
+
+    Requires NumPy. Persists to approx_cache.npz in the cache dir.
+    """
+
+    def __init__(self, cache_dir: Path, threshold: float = APPROX_CACHE_THRESHOLD):
+        self.cache_dir = cache_dir
+        self.threshold = threshold
+        self._prompts: list = []
+        self._paths: list = []
+        self._vectors = np.zeros((0, APPROX_EMBED_DIM), dtype=np.float32)
+        self._load()
+
+    @property
+    def _store_path(self) -> Path:
+        return self.cache_dir / "approx_cache.npz"
+
+    @staticmethod
+    def _embed(prompt: str) -> "np.ndarray":
+        vec = np.zeros(APPROX_EMBED_DIM, dtype=np.float32)
+        for token in prompt.lower().split():
+            # Stable across processes, unlike the salted builtin hash()
+            digest = hashlib.blake2b(token.encode(), digest_size=4).digest()
+            vec[int.from_bytes(digest, "big") % APPROX_EMBED_DIM] += 1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def _load(self) -> None:
+        if not self._store_path.exists():
+            return
+        try:
+            store = np.load(self._store_path, allow_pickle=False)
+            self._vectors = store["vectors"].astype(np.float32)
+            self._prompts = [str(p) for p in store["prompts"]]
+            self._paths = [str(p) for p in store["paths"]]
+            print(f"Approx cache: {len(self._prompts)} entries loaded")
+        except Exception as e:
+            print(f"Approx cache unreadable, starting fresh: {e}")
+
+    def _save(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            self._store_path,
+            vectors=self._vectors,
+            prompts=np.array(self._prompts),
+            paths=np.array(self._paths),
+        )
+
+    def lookup(self, prompt: str) -> Optional[Path]:
+        """Return the cached image path for the most similar prompt, if any."""
+        if not self._prompts:
+            return None
+        sims = self._vectors @ self._embed(prompt)
+        best = int(sims.argmax())
+        if sims[best] < self.threshold:
+            return None
+        path = Path(self._paths[best])
+        if not path.exists():
+            return None
+        print(f"  ≈ Approx cache hit (similarity {sims[best]:.3f})")
+        return path
+
+    def add(self, prompt: str, image_path: Path) -> None:
+        self._prompts.append(prompt)
+        self._paths.append(str(image_path))
+        self._vectors = np.vstack([self._vectors, self._embed(prompt)])
+        self._save()
 
 
 # =============================================================================
 # Asset Generation Functions
 # =============================================================================
 
-def generate_biome_tile(
-    client: OpenRouterClient,
+# Chroma-key removal is CPU-bound per image; with generation running
+# concurrently it would otherwise become the serial tail of the pipeline.
+# A process pool lets several images post-process in true parallel
+# (bypassing the GIL), overlapped with the downloads still in flight.
+_postprocess_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _get_postprocess_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _postprocess_pool
+    if _postprocess_pool is None:
+        _postprocess_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count()
+        )
+    return _postprocess_pool
+
+
+def _shutdown_postprocess_pool() -> None:
+    global _postprocess_pool
+    if _postprocess_pool is not None:
+        _postprocess_pool.shutdown(wait=True)
+        _postprocess_pool = None
+
+
+class _LibUringWriter:
+    """File writes submitted through a shared io_uring ring.
+
+    Queues the write in the kernel with one submission instead of the
+    open/write/close syscall churn of write_bytes — worthwhile on the
+    many-small-files --all runs. The ring is not thread-safe, so a lock
+    serializes the submit/complete window across writer threads.
+    """
+
+    def __init__(self, entries: int = 8):
+        # Current liburing releases expose the ring/completion structs as
+        # Ring/Cqe (the old io_uring()/io_uring_cqe() names are gone)
+        self._ring = liburing.Ring()
+        liburing.io_uring_queue_init(entries, self._ring)
+        self._lock = threading.Lock()
+        self._disabled = False
+        self._self_test()
+
+    def _self_test(self) -> None:
+        """Round-trip one write through the ring before trusting it.
+
+        liburing's Python bindings have broken API compatibility before;
+        verifying real bytes at construction means any future drift raises
+        here — where _get_writer_pool degrades to plain writes — instead of
+        silently corrupting every generated image mid-run.
+        """
+        payload = b"io_uring self-test"
+        tmp_fd, tmp_name = tempfile.mkstemp(prefix="iouring-selftest-")
+        os.close(tmp_fd)
+        tmp = Path(tmp_name)
+        try:
+            self._submit_write(tmp, payload)
+            if tmp.read_bytes() != payload:
+                raise OSError("io_uring self-test read back wrong bytes")
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _submit_write(self, path: Path, data: bytes) -> None:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            with self._lock:
+                sqe = liburing.io_uring_get_sqe(self._ring)
+                # Current signature is (sqe, fd, buf, /, offset=None) —
+                # passing len(data) here would be taken as the file offset
+                liburing.io_uring_prep_write(sqe, fd, data)
+                liburing.io_uring_submit(self._ring)
+                cqe = liburing.Cqe()
+                liburing.io_uring_wait_cqe(self._ring, cqe)
+                try:
+                    try:
+                        result = cqe.res
+                    except AttributeError:
+                        result = cqe.result
+                finally:
+                    # Always reap the completion: an unseen CQE wedges the
+                    # ring and turns every later write into garbage
+                    liburing.io_uring_cqe_seen(self._ring, cqe)
+            if result < 0:
+                raise OSError(-result, os.strerror(-result), str(path))
+            if result != len(data):
+                raise OSError(
+                    f"short io_uring write to {path}: {result}/{len(data)} bytes"
+                )
+        finally:
+            os.close(fd)
+
+    def write(self, path: Path, data: bytes) -> None:
+        if not self._disabled:
+            try:
+                self._submit_write(path, data)
+                return
+            except Exception as e:
+                # One failed submission means the ring can't be trusted;
+                # finish the run on plain writes rather than lose images
+                self._disabled = True
+                print(f"io_uring write failed ({e}), falling back to plain writes")
+        path.write_bytes(data)
+
+    def close(self) -> None:
+        liburing.io_uring_queue_exit(self._ring)
+
+
+# Disk writes are pure I/O; a small thread pool hides their latency behind
+# the HTTP requests still in flight (write_bytes releases the GIL)
+_writer_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_liburing_writer: Optional["_LibUringWriter"] = None
+
+
+def _get_writer_pool() -> concurrent.futures.ThreadPoolExecutor:
+    global _writer_pool, _liburing_writer
+    if _writer_pool is None:
+        _writer_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="writer"
+        )
+        if HAS_LIBURING:
+            try:
+                _liburing_writer = _LibUringWriter()
+            except Exception as e:
+                # io_uring disabled by seccomp/sysctl, or a liburing API
+                # mismatch: either way plain writes still work, and dying
+                # mid-run after API spend would be far worse
+                print(f"io_uring unavailable ({e}), falling back to plain writes")
+    return _writer_pool
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    if _liburing_writer is not None:
+        _liburing_writer.write(path, data)
+    else:
+        path.write_bytes(data)
+
+
+def _shutdown_writer_pool() -> None:
+    """Flush queued writes; call before printing the summary."""
+    global _writer_pool, _liburing_writer
+    if _writer_pool is not None:
+        _writer_pool.shutdown(wait=True)
+        _writer_pool = None
+    if _liburing_writer is not None:
+        _liburing_writer.close()
+        _liburing_writer = None
+
+
+def _report_write_error(path: Path, future: concurrent.futures.Future) -> None:
+    error = future.exception()
+    if error is not None:
+        print(f"  ✗ Failed to write {path}: {error}")
+
+
+def _write_file_async(path: Path, data: bytes) -> None:
+    """Queue a file write on the writer pool instead of blocking the caller."""
+    future = _get_writer_pool().submit(_write_file, path, data)
+    future.add_done_callback(functools.partial(_report_write_error, path))
+
+
+async def postprocess_image(
+    client: AsyncOpenRouterClient,
+    prompt: str,
+    aspect_ratio: str,
+    image_data: bytes,
+    output_format: str = "png"
+) -> bytes:
+    """
+    Remove the chroma-key background, consulting the processed-image cache
+    first so reruns skip the pixel work as well as the API call.
+    """
+    if not HAS_PIL:
+        return image_data
+
+    processed_path = client.cache_path(prompt, aspect_ratio, suffix=f".processed.{output_format}")
+    if processed_path is not None and processed_path.exists():
+        return processed_path.read_bytes()
+
+    # CPU-bound pixel work runs in a worker process so it neither stalls the
+    # event loop nor serializes behind the GIL
+    loop = asyncio.get_running_loop()
+    image_data = await loop.run_in_executor(
+        _get_postprocess_pool(),
+        functools.partial(remove_chroma_key_background, image_data, output_format=output_format)
+    )
+
+    if processed_path is not None:
+        processed_path.write_bytes(image_data)
+    return image_data
+
+
+@functools.lru_cache(maxsize=None)
+def _tile_prompt_parts(biome_name: str, style: Style = STYLE) -> tuple:
+    """Biome-invariant prompt prefix/suffix, concatenated once per biome.
+
+    The autotile path builds 16 prompts per biome that differ only in the
+    variant sentence and seam constraint; caching the shared parts keeps the
+    per-call work to one short f-string and keeps prompt identity stable for
+    the disk cache.
+    """
+    biome = BIOMES[biome_name]
+    prefix = f"Generate an isometric 2D game terrain tile, orthographic 3/4 top-down view, diamond shape. Subject: {biome.base_prompt}. "
+    suffix = f"Visual elements: {biome.features}. Color palette: {biome.color_palette}. Mood: {biome.mood}. Style: {style.bible}. Constraints: {style.tile_constraints}, "
+    return prefix, suffix
+
+
+def _tile_variant_prompt(biome_name: str, variant: int) -> str:
+    """Single-request prompt for one autotile variant (no base-image suffix).
+
+    Shared between generate_biome_tile and the autotile batch fallback,
+    which needs the same prompt identity to locate the variant's raw cache
+    entry when backfilling the batch cache slots.
+    """
+    prefix, suffix = _tile_prompt_parts(biome_name)
+    variant_name, variant_desc = AUTOTILE_VARIANTS[variant]
+    subject = f"Tile variant {variant} ({variant_name}): {variant_desc}. "
+    seam = "seamless edges where connecting to same terrain"
+    return f"{prefix}{subject}{suffix}{seam}. Lighting: {STYLE.lighting}. Generate 1 image."
+
+
+async def generate_biome_tile(
+    client: AsyncOpenRouterClient,
     biome: BiomeConfig,
     output_dir: Path,
     variant: Optional[int] = None,
-    dry_run: bool = False
-) -> bool:
-    """Generate a single biome tile image."""
-    
+    dry_run: bool = False,
+    output_format: str = "png",
+    approx_cache: Optional[ApproxCache] = None,
+    base_image: Optional[bytes] = None
+):
+    """Generate a single biome tile image.
+
+    Returns the image bytes on success (truthy, so boolean tallies still
+    work), True for dry runs and cache reuse, False on failure. When
+    `base_image` is given it is attached to the request so the model
+    re-renders the base tile into the variant instead of starting fresh.
+    """
+
     # Build hyper-specific prompt following (A)(B)(C)(D)(E) structure
     # Reference: Google's Gemini 2.5 Flash Image prompting guide
-    
+
     if variant is not None:
-        variant_name, variant_desc = AUTOTILE_VARIANTS[variant]
         # Autotile variant with edge blending info
-        prompt = f"""Generate an isometric 2D game terrain tile, orthographic 3/4 top-down view, diamond shape. Subject: {biome.base_prompt}. Tile variant {variant} ({variant_name}): {variant_desc}. Visual elements: {biome.features}. Color palette: {biome.color_palette}. Mood: {biome.mood}. Style: {STYLE_BIBLE}. Constraints: {TILE_CONSTRAINTS}, seamless edges where connecting to same terrain. Lighting: {LIGHTING}. Generate 1 image."""
-        filename = f"{variant}.png"
+        prompt = _tile_variant_prompt(biome.name, variant)
+        filename = f"{variant}.{output_format}"
         subdir = output_dir / biome.name
     else:
         # Center tile (variant 15) - seamless on all sides
-        prompt = f"""Generate an isometric 2D game terrain tile, orthographic 3/4 top-down view, diamond shape. Subject: {biome.base_prompt}. This is a center tile that seamlessly connects on all edges. Visual elements: {biome.features}. Color palette: {biome.color_palette}. Mood: {biome.mood}. Style: {STYLE_BIBLE}. Constraints: {TILE_CONSTRAINTS}, perfectly seamless on all edges. Lighting: {LIGHTING}. Generate 1 image."""
-        filename = f"{biome.name}.png"
+        prefix, suffix = _tile_prompt_parts(biome.name)
+        subject = "This is a center tile that seamlessly connects on all edges. "
+        seam = "perfectly seamless on all edges"
+        prompt = f"{prefix}{subject}{suffix}{seam}. Lighting: {STYLE.lighting}. Generate 1 image."
+        filename = f"{biome.name}.{output_format}"
         subdir = output_dir
-    
-    # Ensure output directory exists
-    subdir.mkdir(parents=True, exist_ok=True)
+
+    if base_image is not None:
+        prompt += " Use the attached image as the base tile: keep its palette, lighting and style exactly."
+
+    # Output directories are created up front in run_generation()
     output_path = subdir / filename
     
     if dry_run:
@@ -602,42 +1651,164 @@ def generate_biome_tile(
         return True
     
     print(f"Generating {biome.display_name}" + (f" variant {variant}" if variant is not None else "") + "...")
-    
+
+    if approx_cache is not None:
+        cached = approx_cache.lookup(prompt)
+        if cached is not None:
+            output_path.write_bytes(cached.read_bytes())
+            print(f"  ✓ Reused cached image for {output_path}")
+            return True
+
     # Use 16:9 aspect ratio (closest to 2:1 for isometric tiles)
     # Supported ratios: 1:1, 2:3, 3:2, 3:4, 4:3, 4:5, 5:4, 9:16, 16:9, 21:9
-    image_data = client.generate_image(prompt, aspect_ratio="16:9")
-    
+    image_data = await client.generate_image(prompt, aspect_ratio="16:9",
+                                             base_image=base_image)
+
     if image_data:
         # Post-process: remove magenta background, add true transparency
         if HAS_PIL:
-            image_data = remove_chroma_key_background(image_data)
+            image_data = await postprocess_image(
+                client, _conditioned_key(prompt, base_image), "16:9", image_data,
+                output_format=output_format)
             print(f"  ✓ Background removed")
-        output_path.write_bytes(image_data)
+        _write_file_async(output_path, image_data)
         print(f"  ✓ Saved to {output_path}")
-        return True
+        if approx_cache is not None:
+            # Register the synchronously written cache file, not output_path:
+            # that write is only queued on the writer pool, and a concurrent
+            # variant whose lookup() hits could read it half-written
+            suffix = f".processed.{output_format}" if HAS_PIL else ".png"
+            source = client.cache_path(
+                _conditioned_key(prompt, base_image), "16:9", suffix=suffix
+            )
+            if source is not None and source.exists():
+                approx_cache.add(prompt, source)
+        return image_data
     else:
         print(f"  ✗ Failed to generate")
         return False
 
 
-def generate_building(
-    client: OpenRouterClient,
+@functools.lru_cache(maxsize=None)
+def _autotile_batch_prompt(biome_name: str, style: Style = STYLE) -> str:
+    """Build one prompt covering all 16 autotile variants of a biome.
+
+    The variants share ~90% of their text (style bible, biome description,
+    constraints), so describing the biome once and listing the 16 variants
+    costs one RPM slot and one round of prompt tokenization instead of 16.
+    """
+    biome = BIOMES[biome_name]
+    variant_lines = "\n".join(
+        f"Image {variant + 1} — variant {variant} ({name}): {desc}."
+        for variant, (name, desc) in AUTOTILE_VARIANTS.items()
+    )
+    return f"""Generate {len(AUTOTILE_VARIANTS)} isometric 2D game terrain tiles, orthographic 3/4 top-down view, diamond shape. Subject: {biome.base_prompt}. Visual elements: {biome.features}. Color palette: {biome.color_palette}. Mood: {biome.mood}. Style: {style.bible}. Constraints: {style.tile_constraints}, seamless edges where connecting to same terrain. Lighting: {style.lighting}. Generate one image per numbered variant below, in order:
+{variant_lines}"""
+
+
+async def generate_biome_autotiles(
+    client: AsyncOpenRouterClient,
+    biome: BiomeConfig,
+    output_dir: Path,
+    dry_run: bool = False,
+    output_format: str = "png",
+    approx_cache: Optional[ApproxCache] = None,
+    variant_from_base: bool = False
+) -> int:
+    """Generate all 16 autotile variants of a biome via one batched request.
+
+    Variants missing from the batch response fall back to individual
+    generation. With `variant_from_base`, the base tile is generated (or
+    cache-hit) first and each variant is a conditioned re-render of it —
+    better cross-variant consistency at one request per variant. Returns
+    the number of variants produced.
+    """
+    prompt = _autotile_batch_prompt(biome.name)
+    count = len(AUTOTILE_VARIANTS)
+    subdir = output_dir / biome.name
+
+    if variant_from_base:
+        base = await generate_biome_tile(client, biome, output_dir,
+                                         dry_run=dry_run,
+                                         output_format=output_format,
+                                         approx_cache=approx_cache)
+        base_image = base if isinstance(base, bytes) else None
+        results = await asyncio.gather(*[
+            generate_biome_tile(client, biome, output_dir, variant=variant,
+                                dry_run=dry_run, output_format=output_format,
+                                approx_cache=approx_cache, base_image=base_image)
+            for variant in range(count)
+        ])
+        return sum(1 for ok in results if ok)
+
+    if dry_run:
+        print(f"\n{'='*60}")
+        print(f"PROMPT for {biome.name} autotile batch")
+        print(f"{'='*60}")
+        print(prompt)
+        return count
+
+    print(f"Generating {biome.display_name} autotile batch ({count} variants)...")
+
+    results = await client.generate_image_batch(prompt, count, aspect_ratio="16:9")
+
+    written = 0
+    missing = []
+    for variant, image_data in enumerate(results):
+        if not image_data:
+            missing.append(variant)
+            continue
+        if HAS_PIL:
+            image_data = await postprocess_image(client, f"{prompt}#{variant}", "16:9", image_data,
+                                                 output_format=output_format)
+        _write_file_async(subdir / f"{variant}.{output_format}", image_data)
+        written += 1
+
+    if written:
+        print(f"  ✓ Saved {written}/{count} variants to {subdir}")
+
+    # Regenerate anything the batch response didn't deliver, one at a time
+    for variant in missing:
+        if await generate_biome_tile(client, biome, output_dir, variant=variant,
+                                     output_format=output_format,
+                                     approx_cache=approx_cache):
+            written += 1
+            # Backfill the batch cache slot from the single-variant raw
+            # cache; without this the slot stays empty forever and every
+            # rerun re-issues (and re-pays for) the whole batch
+            slot = client.cache_path(f"{prompt}#{variant}", "16:9")
+            raw = client.cache_path(_tile_variant_prompt(biome.name, variant), "16:9")
+            if (slot is not None and not slot.exists()
+                    and raw is not None and raw.exists()):
+                slot.write_bytes(raw.read_bytes())
+
+    return written
+
+
+@functools.lru_cache(maxsize=None)
+def _building_prompt(building_name: str, style: Style = STYLE) -> str:
+    """Full generation prompt for a building, built once per building.
+
+    Follows the hyper-specific (A)(B)(C)(D)(E) structure from Google's
+    Gemini 2.5 Flash Image prompting guide.
+    """
+    config = BUILDINGS[building_name]
+    return f"""Generate an isometric 2D game building, orthographic 3/4 top-down view, for a cat colony game. Subject: {config["prompt"]}. Visual details: {config["features"]}. Scale: cat-sized structure, cozy proportions. Style: {style.bible}, natural materials like wood, stone, leaves, branches. Constraints: {style.building_constraints}, warm inviting safe-feeling design. Lighting: {style.lighting}. Generate 1 image."""
+
+
+async def generate_building(
+    client: AsyncOpenRouterClient,
     building_name: str,
     config: dict,
     output_dir: Path,
-    dry_run: bool = False
+    dry_run: bool = False,
+    output_format: str = "png"
 ) -> bool:
     """Generate a building asset."""
-    
-    width, height = config["size"]
-    building_display_name = building_name.replace('_', ' ')
-    
-    # Build hyper-specific prompt following (A)(B)(C)(D)(E) structure
-    # Reference: Google's Gemini 2.5 Flash Image prompting guide
-    prompt = f"""Generate an isometric 2D game building, orthographic 3/4 top-down view, for a cat colony game. Subject: {config["prompt"]}. Visual details: {config["features"]}. Scale: cat-sized structure, cozy proportions. Style: {STYLE_BIBLE}, natural materials like wood, stone, leaves, branches. Constraints: {BUILDING_CONSTRAINTS}, warm inviting safe-feeling design. Lighting: {LIGHTING}. Generate 1 image."""
-    
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / f"{building_name}.png"
+
+    prompt = _building_prompt(building_name)
+
+    output_path = output_dir / f"{building_name}.{output_format}"
     
     if dry_run:
         print(f"\n{'='*60}")
@@ -659,14 +1830,15 @@ def generate_building(
     else:
         aspect_ratio = "1:1"  # Square-ish
     
-    image_data = client.generate_image(prompt, aspect_ratio=aspect_ratio)
-    
+    image_data = await client.generate_image(prompt, aspect_ratio=aspect_ratio)
+
     if image_data:
         # Post-process: remove magenta background, add true transparency
         if HAS_PIL:
-            image_data = remove_chroma_key_background(image_data)
+            image_data = await postprocess_image(client, prompt, aspect_ratio, image_data,
+                                                 output_format=output_format)
             print(f"  ✓ Background removed")
-        output_path.write_bytes(image_data)
+        _write_file_async(output_path, image_data)
         print(f"  ✓ Saved to {output_path}")
         return True
     else:
@@ -687,7 +1859,7 @@ def main():
     
     parser.add_argument(
         "--api-key",
-        default=os.environ.get("OPENROUTER_API_KEY", OPENROUTER_API_KEY),
+        default=os.environ.get("OPENROUTER_API_KEY"),
         help="OpenRouter API key (or set OPENROUTER_API_KEY env var)"
     )
     parser.add_argument(
@@ -726,6 +1898,43 @@ def main():
         action="store_true",
         help="Print prompts without generating images"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the prompt-hash disk cache and regenerate everything"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["png", "webp"],
+        default="png",
+        help="Output image format (webp is lossless and 30-50%% smaller)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.0,
+        help="Abort generation before exceeding this USD spend "
+             "(cumulative across runs via the cache manifest; 0 = unlimited)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_CONCURRENT,
+        help=f"Maximum in-flight API requests (default: {MAX_CONCURRENT})"
+    )
+    parser.add_argument(
+        "--variant-from-base",
+        action="store_true",
+        help="Generate each autotile variant as a conditioned re-render of "
+             "the biome's base tile (better consistency, one request per variant)"
+    )
+    parser.add_argument(
+        "--approx-cache",
+        action="store_true",
+        help="Reuse cached images for near-duplicate prompts "
+             f"(cosine similarity >= {APPROX_CACHE_THRESHOLD}; requires numpy). "
+             "Trades per-variant fidelity for fewer paid requests."
+    )
     
     args = parser.parse_args()
     
@@ -742,91 +1951,122 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    # Initialize client
-    client = OpenRouterClient(args.api_key) if not args.dry_run else None
-    
+    fail_count = asyncio.run(run_generation(args))
+
+    if fail_count > 0:
+        sys.exit(1)
+
+
+async def run_generation(args) -> int:
+    """Run all requested generation concurrently. Returns the failure count."""
     success_count = 0
     fail_count = 0
-    
-    # Generate biome tiles
-    if args.biomes or args.all or args.biome:
-        print("\n" + "="*60)
-        print("GENERATING BIOME TILES")
-        print("="*60)
-        
-        biomes_to_generate = [args.biome] if args.biome else list(BIOMES.keys())
-        
-        for biome_name in biomes_to_generate:
-            biome = BIOMES[biome_name]
-            if generate_biome_tile(
-                client, biome,
-                args.output_dir / "tiles" / "isometric",
-                dry_run=args.dry_run
-            ):
-                success_count += 1
-            else:
-                fail_count += 1
-            
-            # Rate limiting delay
-            if not args.dry_run:
-                time.sleep(1)
-    
-    # Generate autotile variants
-    if args.autotile or args.all:
-        print("\n" + "="*60)
-        print("GENERATING AUTOTILE VARIANTS")
-        print("="*60)
-        
-        biomes_to_generate = [args.biome] if args.biome else list(BIOMES.keys())
-        
-        for biome_name in biomes_to_generate:
-            biome = BIOMES[biome_name]
-            print(f"\nBiome: {biome.display_name}")
-            
-            for variant in range(16):
-                if generate_biome_tile(
-                    client, biome,
-                    args.output_dir / "tiles" / "isometric",
-                    variant=variant,
-                    dry_run=args.dry_run
-                ):
-                    success_count += 1
+
+    async with contextlib.AsyncExitStack() as stack:
+        # Initialize client (dry runs never hit the network)
+        client = None
+        approx_cache = None
+        if not args.dry_run:
+            cache_dir = None if args.no_cache else args.output_dir / ".cache"
+            client = await stack.enter_async_context(
+                AsyncOpenRouterClient(
+                    args.api_key,
+                    cache_dir=cache_dir,
+                    budget=args.budget,
+                    concurrency=args.concurrency,
+                )
+            )
+            if args.approx_cache:
+                if not HAS_NUMPY:
+                    print("Warning: --approx-cache requires numpy; ignoring")
+                elif cache_dir is None:
+                    print("Warning: --approx-cache has no effect with --no-cache; ignoring")
                 else:
-                    fail_count += 1
-                
-                # Rate limiting delay
-                if not args.dry_run:
-                    time.sleep(1)
-    
-    # Generate buildings
-    if args.buildings or args.all:
+                    approx_cache = ApproxCache(cache_dir)
+
+        biomes_to_generate = [args.biome] if args.biome else list(BIOMES.keys())
+        tile_dir = args.output_dir / "tiles" / "isometric"
+
+        # Collect every coroutine up front so one gather drives base tiles,
+        # autotile batches and buildings concurrently — the semaphore stays
+        # saturated instead of draining between sections
+        sections = []
+        tasks = []          # each resolves to True/False
+        autotile_tasks = []  # each resolves to a written-variant count
+
+        # Output dirs are created once here; the generate functions assume
+        # they exist
+        if args.biomes or args.all or args.biome:
+            sections.append("BIOME TILES")
+            tile_dir.mkdir(parents=True, exist_ok=True)
+            tasks += [
+                generate_biome_tile(
+                    client, BIOMES[biome_name], tile_dir,
+                    dry_run=args.dry_run,
+                    output_format=args.format,
+                    approx_cache=approx_cache
+                )
+                for biome_name in biomes_to_generate
+            ]
+
+        if args.autotile or args.all:
+            sections.append("AUTOTILE VARIANTS")
+            for biome_name in biomes_to_generate:
+                (tile_dir / biome_name).mkdir(parents=True, exist_ok=True)
+            # One batched request per biome covers all 16 variants
+            autotile_tasks += [
+                generate_biome_autotiles(
+                    client, BIOMES[biome_name], tile_dir,
+                    dry_run=args.dry_run,
+                    output_format=args.format,
+                    approx_cache=approx_cache,
+                    variant_from_base=args.variant_from_base
+                )
+                for biome_name in biomes_to_generate
+            ]
+
+        if args.buildings or args.all:
+            sections.append("BUILDINGS")
+            building_dir = args.output_dir / "buildings" / "isometric"
+            building_dir.mkdir(parents=True, exist_ok=True)
+            tasks += [
+                generate_building(
+                    client, name, config,
+                    building_dir,
+                    dry_run=args.dry_run,
+                    output_format=args.format
+                )
+                for name, config in BUILDINGS.items()
+            ]
+
         print("\n" + "="*60)
-        print("GENERATING BUILDINGS")
+        print("GENERATING " + " + ".join(sections))
         print("="*60)
-        
-        for name, config in BUILDINGS.items():
-            if generate_building(
-                client, name, config,
-                args.output_dir / "buildings" / "isometric",
-                dry_run=args.dry_run
-            ):
-                success_count += 1
-            else:
-                fail_count += 1
-            
-            if not args.dry_run:
-                time.sleep(1)
-    
+
+        results = await asyncio.gather(*tasks, *autotile_tasks)
+        flags = results[:len(tasks)]
+        variant_counts = results[len(tasks):]
+
+        success_count += sum(1 for ok in flags if ok)
+        fail_count += sum(1 for ok in flags if not ok)
+        success_count += sum(variant_counts)
+        fail_count += sum(
+            len(AUTOTILE_VARIANTS) - written for written in variant_counts
+        )
+
+    _shutdown_postprocess_pool()
+    _shutdown_writer_pool()
+
     # Note: Cat sprites are rendered dynamically via beastyrabbit.com API
     # See lib/cat-renderer/api.ts - no static cat assets needed
-    
+
     # Summary
     print("\n" + "="*60)
     print("GENERATION COMPLETE")
     print("="*60)
     print(f"Successful: {success_count}")
     print(f"Failed: {fail_count}")
-    
+
     # Cost summary
     if client:
         cost_summary = client.get_cost_summary()
@@ -840,9 +2080,8 @@ def main():
             print(f"Total cost: ${cost_summary['total_cost_usd']:.4f} USD")
         else:
             print("Total cost: (not available in response)")
-    
-    if fail_count > 0:
-        sys.exit(1)
+
+    return fail_count
 
 
 if __name__ == "__main__":
@@ -1,32 +1,166 @@
 import os
-from PIL import Image, ImageDraw, ImageFont
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+# PIL and NumPy are imported lazily inside the drawing helpers so that
+# importing this module (or just building the job list) stays instant
+
+# Optional: one slice-fill instead of PIL's per-pixel rasterizer
+np = None
+_NUMPY_CHECKED = False
+
+
+def _ensure_numpy():
+    global np, _NUMPY_CHECKED
+    if not _NUMPY_CHECKED:
+        _NUMPY_CHECKED = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np is not None
+
+
+@lru_cache(maxsize=1)
+def _get_font():
+    # Loaded once per process instead of once per placeholder
+    from PIL import ImageFont
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=512)
+def _render_text(text):
+    """Rasterize a label once; repeated labels (e.g. 'F', 'W') share the bitmap."""
+    from PIL import Image, ImageDraw
+    font = _get_font()
+    probe = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+    bbox = probe.textbbox((0, 0), text, font=font)
+    layer = Image.new('RGBA', (max(bbox[2] + 1, 1), max(bbox[3] + 1, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).text((0, 0), text, fill="black", font=font)
+    return layer
+
+
+@lru_cache(maxsize=32)
+def _circle_masks(size):
+    """Fill and outline masks for an ellipse inscribed in `size`.
+
+    Keyed by size alone: every circle placeholder of one size shares the
+    same two boolean masks regardless of color.
+    """
+    w, h = size
+    yy, xx = np.ogrid[:h, :w]
+    cx, cy = (w - 1) / 2, (h - 1) / 2
+    rx, ry = (w - 1) / 2, (h - 1) / 2
+    mask = ((xx - cx) / rx) ** 2 + ((yy - cy) / ry) ** 2 <= 1.0
+    # Shrink the radii by the outline width to find the interior
+    inner = ((xx - cx) / (rx - 1)) ** 2 + ((yy - cy) / (ry - 1)) ** 2 <= 1.0
+    return mask, mask & ~inner
+
+
+@lru_cache(maxsize=128)
+def _shape_template(size, color, shape):
+    """Filled shape with 1px black outline; identical specs share one buffer.
+
+    Callers must .copy() before drawing on the result — lru_cache hands
+    out the same array every time.
+    """
+    from PIL import ImageColor
+    w, h = size
+    rgba = ImageColor.getrgb(color) + (255,)
+    arr = np.zeros((h, w, 4), dtype=np.uint8)
+    if shape == "rect":
+        arr[:, :] = rgba
+        arr[0, :] = arr[-1, :] = (0, 0, 0, 255)
+        arr[:, 0] = arr[:, -1] = (0, 0, 0, 255)
+    elif shape == "circle":
+        mask, ring = _circle_masks(size)
+        arr[mask] = rgba
+        arr[ring] = (0, 0, 0, 255)
+    return arr
+
+
+def _blit_label(arr, text, x, y):
+    """Alpha-composite the memoized label bitmap onto a NumPy buffer."""
+    label = np.asarray(_render_text(text), dtype=np.uint16)
+    lh = min(label.shape[0], arr.shape[0] - y)
+    lw = min(label.shape[1], arr.shape[1] - x)
+    if lh <= 0 or lw <= 0:
+        return
+    label = label[:lh, :lw]
+    region = arr[y:y + lh, x:x + lw].astype(np.uint16)
+    alpha = label[..., 3:4]
+    arr[y:y + lh, x:x + lw, :3] = (
+        (label[..., :3] * alpha + region[..., :3] * (255 - alpha)) // 255
+    ).astype(np.uint8)
+    arr[y:y + lh, x:x + lw, 3:4] = (
+        alpha + region[..., 3:4] * (255 - alpha) // 255
+    ).astype(np.uint8)
+
+
+def _png_chunk(tag, data):
+    return (
+        struct.pack('>I', len(data)) + tag + data
+        + struct.pack('>I', zlib.crc32(tag + data))
+    )
+
+
+def _write_png(path, arr):
+    """Hand-rolled RGBA PNG writer: signature + IHDR + one IDAT + IEND.
+
+    Skips PIL's encoder setup entirely; filter 0 on every scanline and
+    zlib level 1 are plenty for near-flat placeholder art.
+    """
+    h, w = arr.shape[:2]
+    data = arr.tobytes()
+    stride = w * 4
+    raw = b''.join(
+        b'\x00' + data[y * stride:(y + 1) * stride] for y in range(h)
+    )
+    ihdr = struct.pack('>IIBBBBB', w, h, 8, 6, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(_png_chunk(b'IHDR', ihdr))
+        f.write(_png_chunk(b'IDAT', zlib.compress(raw, 1)))
+        f.write(_png_chunk(b'IEND', b''))
+
 
 def create_placeholder(path, size, color, text, shape="rect"):
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Parent directories are created up front in main()
+    if _ensure_numpy():
+        # Pure NumPy + hand-rolled encoder: PIL only rasterizes the label
+        arr = _shape_template(size, color, shape).copy()
+        _blit_label(arr, text, 5, int(size[1]/2 - 5))
+        _write_png(path, arr)
+        print(f"Created {path}")
+        return
+
+    from PIL import Image, ImageDraw
     img = Image.new('RGBA', size, (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
-    
-    # Draw shape
     if shape == "rect":
         draw.rectangle([(0, 0), (size[0]-1, size[1]-1)], fill=color, outline="black")
     elif shape == "circle":
         draw.ellipse([(0, 0), (size[0]-1, size[1]-1)], fill=color, outline="black")
-    
-    # Draw text
-    try:
-        # Try to load a default font, otherwise use default
-        font = ImageFont.load_default()
-    except:
-        font = None
-        
-    # Simple text centering
-    # text_width = draw.textlength(text, font=font) # newer PIL
-    # For older PIL compatibility we might just draw at top left or center roughly
-    draw.text((5, size[1]/2 - 5), text, fill="black", font=font)
-    
-    img.save(path)
+
+    # Draw text (alpha-composite the memoized label bitmap, same
+    # rough-centered offset as before)
+    label = _render_text(text)
+    img.paste(label, (5, int(size[1]/2 - 5)), label)
+
+    # These are solid-color shapes, so max zlib effort buys nothing:
+    # level 1 encodes several times faster for nearly the same file size
+    img.save(path, format='PNG', compress_level=1, optimize=False)
     print(f"Created {path}")
 
+
+def create_placeholder_star(job):
+    # ProcessPoolExecutor.map passes one argument per call
+    create_placeholder(*job)
+
+
 # 1. Cat Sprites
 # Variants: Orange Tabby, Gray Tabby, Black, White, Calico, Tuxedo
 # Poses: idle, walking, sleeping, eating, alert
@@ -41,16 +175,6 @@ cat_colors = {
 
 cat_poses = ["idle", "walking", "sleeping", "eating", "alert"]
 
-for variant, color in cat_colors.items():
-    for pose in cat_poses:
-        create_placeholder(
-            f"public/images/cats/{variant}/{pose}.png",
-            (128, 128),
-            color,
-            f"{variant}\n{pose}",
-            shape="circle"
-        )
-
 # 2. Buildings
 buildings = {
     "den": "#8B4513",
@@ -64,21 +188,6 @@ buildings = {
     "mouse_farm": "#A0522D"
 }
 
-for name, color in buildings.items():
-    create_placeholder(
-        f"public/images/buildings/{name}.png",
-        (150, 150),
-        color,
-        name
-    )
-    # Construction states
-    create_placeholder(
-        f"public/images/buildings/{name}-blueprint.png",
-        (150, 150),
-        "#A9A9A9",
-        f"{name}\nblueprint"
-    )
-
 # 3. Tiles
 tiles = {
     "field": "#9ACD32",
@@ -88,14 +197,6 @@ tiles = {
     "enemy_territory": "#8B0000"
 }
 
-for name, color in tiles.items():
-    create_placeholder(
-        f"public/images/tiles/{name}.png",
-        (150, 150),
-        color,
-        name
-    )
-
 # 4. Enemies
 enemies = {
     "fox": "#FF4500",
@@ -113,15 +214,6 @@ sizes = {
     "rival_cat": (128, 128)
 }
 
-for name, color in enemies.items():
-    create_placeholder(
-        f"public/images/enemies/{name}.png",
-        sizes.get(name, (128, 128)),
-        color,
-        name,
-        shape="circle"
-    )
-
 # 5. Resources
 resources = {
     "food": "#CD5C5C",
@@ -131,15 +223,6 @@ resources = {
     "blessings": "#FFD700"
 }
 
-for name, color in resources.items():
-    create_placeholder(
-        f"public/images/resources/{name}.png",
-        (48, 48),
-        color,
-        name[0].upper()
-    )
-
-
 # 6. Task Icons
 tasks = {
     "hunt": "#8B4513",
@@ -156,15 +239,6 @@ tasks = {
     "rest": "#ADD8E6"
 }
 
-for name, color in tasks.items():
-    create_placeholder(
-        f"public/images/ui/tasks/{name}.png",
-        (64, 64),
-        color,
-        name[0].upper(),
-        shape="circle"
-    )
-
 # 7. Status Icons
 statuses = {
     "leader": "#FFD700",
@@ -176,14 +250,101 @@ statuses = {
     "happy": "#FF1493"
 }
 
-for name, color in statuses.items():
-    create_placeholder(
-        f"public/images/ui/status/{name}.png",
-        (32, 32),
-        color,
-        name[0].upper(),
-        shape="circle"
-    )
 
-print("All placeholders created!")
+def build_jobs():
+    """Collect every placeholder as a (path, size, color, text, shape) tuple."""
+    jobs = []
+
+    for variant, color in cat_colors.items():
+        for pose in cat_poses:
+            jobs.append((
+                f"public/images/cats/{variant}/{pose}.png",
+                (128, 128),
+                color,
+                f"{variant}\n{pose}",
+                "circle"
+            ))
+
+    for name, color in buildings.items():
+        jobs.append((
+            f"public/images/buildings/{name}.png",
+            (150, 150),
+            color,
+            name,
+            "rect"
+        ))
+        # Construction states
+        jobs.append((
+            f"public/images/buildings/{name}-blueprint.png",
+            (150, 150),
+            "#A9A9A9",
+            f"{name}\nblueprint",
+            "rect"
+        ))
+
+    for name, color in tiles.items():
+        jobs.append((
+            f"public/images/tiles/{name}.png",
+            (150, 150),
+            color,
+            name,
+            "rect"
+        ))
+
+    for name, color in enemies.items():
+        jobs.append((
+            f"public/images/enemies/{name}.png",
+            sizes.get(name, (128, 128)),
+            color,
+            name,
+            "circle"
+        ))
+
+    for name, color in resources.items():
+        jobs.append((
+            f"public/images/resources/{name}.png",
+            (48, 48),
+            color,
+            name[0].upper(),
+            "rect"
+        ))
+
+    for name, color in tasks.items():
+        jobs.append((
+            f"public/images/ui/tasks/{name}.png",
+            (64, 64),
+            color,
+            name[0].upper(),
+            "circle"
+        ))
+
+    for name, color in statuses.items():
+        jobs.append((
+            f"public/images/ui/status/{name}.png",
+            (32, 32),
+            color,
+            name[0].upper(),
+            "circle"
+        ))
+
+    return jobs
+
+
+def main():
+    jobs = build_jobs()
+    # ~100 placeholders share a handful of parent dirs: create each once
+    # instead of stat+mkdir per image
+    for parent in {os.path.dirname(path) for path, *_ in jobs}:
+        os.makedirs(parent, exist_ok=True)
+    # Group similar specs so each worker chunk reuses the same cached
+    # shape templates and circle masks
+    jobs.sort(key=lambda job: (job[1], job[4], job[2]))
+    # Each image is independent CPU work (draw + PNG deflate), so shard
+    # across processes
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(create_placeholder_star, jobs, chunksize=8))
+    print(f"All {len(jobs)} placeholders created!")
+
 
+if __name__ == "__main__":
+    main()